@@ -26,6 +26,23 @@ os.makedirs("data", exist_ok=True)
 os.makedirs("analysis", exist_ok=True)
 os.makedirs("recommendations", exist_ok=True)
 
+# Trading session hours (UTC, end exclusive); sessions overlap, so a bar can belong to several
+TRADING_SESSIONS = {
+    "asian": (0, 9),
+    "european": (7, 16),
+    "us": (12, 21)
+}
+
+# Currencies most actively traded during each session
+SESSION_CURRENCIES = {
+    "asian": ["JPY", "AUD", "NZD"],
+    "european": ["EUR", "GBP", "CHF"],
+    "us": ["USD", "CAD"]
+}
+
+# Period used for the per-session ATR
+ATR_PERIOD = 14
+
 class SimpleForexBot:
     """
     A simplified forex trading bot that provides trade recommendations via Telegram.
@@ -52,6 +69,16 @@ class SimpleForexBot:
         # User settings
         self.user_settings = {}
         
+        # Running per-session statistics keyed by (session, pair), updated bar by bar
+        self.session_stats = {}
+        
+        # Last close seen for each pair (needed for true range and returns)
+        self.last_close = {}
+        
+        # Day trade opportunities keyed by session, then by pair
+        self.opportunity_index = {session: {} for session in list(TRADING_SESSIONS) + ["all"]}
+        self._build_opportunity_index()
+        
         logger.info("SimpleForexBot initialized")
     
     async def start_command(self, update, context):
@@ -210,18 +237,27 @@ class SimpleForexBot:
         
         account_size = self.user_settings[user_id]["account_size"]
         risk_per_trade = self.user_settings[user_id]["risk_per_trade"]
+        preferred_session = self.user_settings[user_id]["preferred_session"]
         
         # Send processing message
-        await update.message.reply_text("🔍 Analyzing the forex market for day trade opportunities... This may take a moment.")
+        await update.message.reply_text(f"🔍 Looking up day trade opportunities for the {preferred_session.upper()} session...")
         
         try:
-            # Generate day trade recommendations
-            recommendations = self.generate_day_trade_recommendations(
+            # Look up precomputed day trade opportunities for the user's session
+            recommendations = self.get_session_day_trades(
+                session=preferred_session,
                 num_recommendations=3,
                 account_size=account_size,
                 risk_per_trade=risk_per_trade
             )
             
+            if not recommendations:
+                await update.message.reply_text(
+                    f"No day trade opportunities are currently indexed for the {preferred_session.upper()} session.\n"
+                    f"Try again later or change your session with /settings."
+                )
+                return
+            
             # Send recommendations
             for i, recommendation in enumerate(recommendations, 1):
                 # Format message
@@ -233,7 +269,8 @@ class SimpleForexBot:
             # Send summary
             summary_message = (
                 "*Day Trade Opportunities Summary:*\n\n"
-                f"I've analyzed the forex market and provided you with {len(recommendations)} day trade opportunities.\n\n"
+                f"I've analyzed the forex market and provided you with {len(recommendations)} day trade opportunities "
+                f"for the {preferred_session.upper()} session.\n\n"
                 f"These trades are designed for intraday execution with medium risk level.\n"
                 f"Position sizes are calculated based on your risk setting of ${risk_per_trade} per trade.\n\n"
                 f"Use /swingtrades to get swing trade opportunities instead."
@@ -304,6 +341,168 @@ class SimpleForexBot:
             
             await update.message.reply_text(error_message, parse_mode=telegram.constants.ParseMode.MARKDOWN)
     
+    def _get_sessions_for_hour(self, hour):
+        """
+        Get the trading sessions that are open at a given UTC hour.
+        
+        Args:
+            hour (int): Hour of the day in UTC (0-23)
+            
+        Returns:
+            list: Names of the open sessions
+        """
+        return [
+            session for session, (start, end) in TRADING_SESSIONS.items()
+            if start <= hour < end
+        ]
+    
+    def _get_sessions_for_pair(self, pair):
+        """
+        Get the trading sessions in which a pair is actively traded.
+        
+        Args:
+            pair (str): Currency pair (e.g. "EURUSD=X")
+            
+        Returns:
+            list: Names of the sessions
+        """
+        base, quote = pair[:3], pair[3:6]
+        
+        return [
+            session for session, currencies in SESSION_CURRENCIES.items()
+            if base in currencies or quote in currencies
+        ]
+    
+    def update_session_stats(self, pair, bar):
+        """
+        Update the running session statistics and opportunity index with a new bar.
+        
+        Statistics are updated incrementally (Welford for return volatility, Wilder
+        smoothing for ATR), so no history needs to be rescanned.
+        
+        Args:
+            pair (str): Currency pair
+            bar (dict): Bar with 'timestamp' (datetime, UTC), 'high', 'low' and 'close'
+        """
+        prev_close = self.last_close.get(pair)
+        self.last_close[pair] = bar['close']
+        
+        if prev_close is None:
+            # Need a previous close for true range and returns
+            return
+        
+        true_range = max(
+            bar['high'] - bar['low'],
+            abs(bar['high'] - prev_close),
+            abs(bar['low'] - prev_close)
+        )
+        bar_return = np.log(bar['close'] / prev_close)
+        
+        for session in self._get_sessions_for_hour(bar['timestamp'].hour):
+            stats = self.session_stats.setdefault((session, pair), {
+                'bars': 0,
+                'mean_return': 0.0,
+                'm2': 0.0,
+                'volatility': 0.0,
+                'atr': 0.0
+            })
+            
+            stats['bars'] += 1
+            n = stats['bars']
+            
+            # Welford update of return mean/variance
+            delta = bar_return - stats['mean_return']
+            stats['mean_return'] += delta / n
+            stats['m2'] += delta * (bar_return - stats['mean_return'])
+            stats['volatility'] = float(np.sqrt(stats['m2'] / (n - 1))) if n > 1 else 0.0
+            
+            # Wilder ATR (simple average until the period is filled)
+            period = min(n, ATR_PERIOD)
+            stats['atr'] = (stats['atr'] * (period - 1) + true_range) / period
+        
+        self._index_pair(pair)
+    
+    def _index_pair(self, pair, recommendation=None):
+        """
+        Refresh the opportunity index entries for a single pair.
+        
+        Args:
+            pair (str): Currency pair
+            recommendation (dict): New recommendation for the pair, or None to keep the current one
+        """
+        if recommendation is None:
+            recommendation = self.opportunity_index["all"].get(pair)
+            if recommendation is None:
+                return
+        
+        recommendation['session_stats'] = {}
+        
+        for session in self._get_sessions_for_pair(pair):
+            stats = self.session_stats.get((session, pair))
+            if stats is not None:
+                recommendation['session_stats'][session] = {
+                    'volatility': stats['volatility'],
+                    'atr': stats['atr'],
+                    'bars': stats['bars']
+                }
+            self.opportunity_index[session][pair] = recommendation
+        
+        self.opportunity_index["all"][pair] = recommendation
+    
+    def _build_opportunity_index(self):
+        """Build the session opportunity index from the current day trade candidates."""
+        candidates = self.generate_day_trade_recommendations(num_recommendations=len(self.forex_pairs))
+        
+        for session_index in self.opportunity_index.values():
+            session_index.clear()
+        
+        for recommendation in candidates:
+            self._index_pair(recommendation['pair'], recommendation)
+        
+        logger.info(f"Indexed {len(candidates)} day trade opportunities by session")
+    
+    def get_session_day_trades(self, session="all", num_recommendations=3, account_size=5000, risk_per_trade=60):
+        """
+        Look up indexed day trade opportunities for a trading session.
+        
+        Args:
+            session (str): Trading session ("all", "asian", "european" or "us")
+            num_recommendations (int): Number of recommendations to return
+            account_size (float): Trading account size
+            risk_per_trade (float): Risk amount per trade
+            
+        Returns:
+            list: List of trade recommendations sized for the given risk
+        """
+        candidates = sorted(
+            self.opportunity_index.get(session, {}).values(),
+            key=lambda x: x['score'],
+            reverse=True
+        )[:num_recommendations]
+        
+        recommendations = []
+        
+        for candidate in candidates:
+            # Re-size the indexed opportunity for this user's risk settings
+            recommendation = dict(candidate)
+            position_size = self._calculate_position_size(
+                candidate['entry_price'],
+                candidate['stop_loss'],
+                risk_per_trade,
+                candidate['pair']
+            )
+            recommendation['risk_amount'] = risk_per_trade
+            recommendation['risk_percentage'] = (risk_per_trade / account_size) * 100
+            recommendation['potential_profit'] = risk_per_trade * candidate['risk_reward_ratio']
+            recommendation['position_size'] = {
+                'micro_lots': position_size['micro_lots']
+            }
+            
+            recommendations.append(recommendation)
+        
+        logger.info(f"Looked up {len(recommendations)} day trade opportunities for {session} session")
+        return recommendations
+    
     def generate_day_trade_recommendations(self, num_recommendations=3, account_size=5000, risk_per_trade=60):
         """
         Generate day trade recommendations.
@@ -615,6 +814,11 @@ class SimpleForexBot:
         for signal in recommendation['signals']:
             message += f"• {signal}\n"
         
+        if recommendation.get('session_stats'):
+            message += "\n*Session Stats:*\n"
+            for session, stats in recommendation['session_stats'].items():
+                message += f"• {session.upper()}: ATR {stats['atr']:.5f}, volatility {stats['volatility'] * 100:.3f}%\n"
+        
         message += f"\n*Score:* {recommendation['score']} (higher is better)\n"
         
         return message